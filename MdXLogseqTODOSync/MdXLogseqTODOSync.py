@@ -1,15 +1,85 @@
 from textwrap import dedent
 from beartype import beartype
 from pathlib import Path
-from collections.abc import Sequence
+from itertools import islice
+from operator import attrgetter
+from functools import lru_cache
 import LogseqMarkdownParser
 import re
 import typing
+from stat import S_IMODE, S_ISREG
+import os
+
+try:
+    # optional DFA based engine, see the "fast" extra in setup.py
+    import re2
+except ImportError:
+    re2 = None
+
+# a line that starts a new Logseq block, same rule as LogseqMarkdownParser
+_BULLET_RE = re.compile(r"[^\S\n]*[-*] ")
+# leading whitespace of a block, a non-breaking space counts as a space
+_INDENT_RE = re.compile("[ \t\xa0]*")
+# a line holding a block property (same rule as LogseqMarkdownParser) with
+# the newline before it, the first line of a block is the bullet itself
+_PROPERTY_LINE_RE = re.compile(r"\n[^\n]*?[ \t]\w[\w_-]*\w:: [^\n]+")
+# a LOGBOOK drawer, non greedy so that text between two drawers is kept
+_LOGBOOK_RE = re.compile(r":LOGBOOK:.*?:END:", re.DOTALL)
+
+# syntax that re2 matches differently than re: its \w, \d, \s and \b are
+# ASCII only and its $ only matches at the very end of the text
+_RE2_MISMATCH_RE = re.compile(r"\\[wWdDsSbB]|\$")
+
+# characters that make a delimiter a real regex instead of a plain string
+_REGEX_META_RE = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str, flags: int = 0) -> re.Pattern:
+    """
+    Compile a pattern given by the user, compiled patterns are shared between instances.
+
+    Args:
+        pattern (str): The regex pattern.
+        flags (int, optional): Flags given to re.compile. Default: 0.
+
+    Returns:
+        re.Pattern: The compiled pattern.
+    """
+    return re.compile(pattern, flags)
+
+
+# only looks at the first line of each block, see MdXLogseqTODOSync._fast_scan
+_DEFAULT_MUST_MATCH_REGEX = r"^\s*- (TODO|DONE|DOING|NOW|LATER|#+) "
+# prefixes accepted by _DEFAULT_MUST_MATCH_REGEX besides the headings
+_DEFAULT_MUST_MATCH_PREFIXES = ("- TODO ", "- DONE ", "- DOING ", "- NOW ", "- LATER ")
+
+
+def _default_must_match(content: str) -> bool:
+    """
+    Same result as searching _DEFAULT_MUST_MATCH_REGEX in content, without the regex engine.
+
+    Args:
+        content (str): Content of a block.
+
+    Returns:
+        bool: True if the block starts with a task keyword or a heading.
+    """
+    content = content.lstrip()
+    if content.startswith(_DEFAULT_MUST_MATCH_PREFIXES):
+        return True
+    if not content.startswith("- #"):
+        return False
+    # "- " then one or more "#" then a space
+    i = 3
+    while content.startswith("#", i):
+        i += 1
+    return content.startswith(" ", i)
 
-@beartype  # this will apply to all methods
 class MdXLogseqTODOSync:
     VERSION: str = "0.1.0"
 
+    @beartype  # only the public methods are type checked
     def __init__(
         self,
         input_file: Path | str,
@@ -22,7 +92,7 @@ class MdXLogseqTODOSync:
         output_delim_end: str = r"<!-- END_TODO -->",
 
         bulletpoint_max_level: int = -1,
-        must_match_regex: str = r"^\s*- (TODO|DONE|DOING|NOW|LATER|#+) ",
+        must_match_regex: str = _DEFAULT_MUST_MATCH_REGEX,
         sub_pattern: typing.Optional[typing.Tuple[str, str]] = (r"^(\s*)- (TODO|DONE|DOING|NOW|LATER) ", r"\1- "),
         remove_block_properties: bool = True,
         keep_new_lines: bool = True,
@@ -45,6 +115,9 @@ class MdXLogseqTODOSync:
             output_delim_end (str, optional): Regex pattern to match the end of output section. Default: "<!-- END_TODO -->".
             bulletpoint_max_level (int, optional): Maximum level of bullet points to process. Use -1 for unlimited. Default: -1.
             must_match_regex (str, optional): Regex pattern that lines must match to be included. Default: r"^\s*- (TODO|DONE|DOING|NOW|LATER|#+) ".
+                                              If google-re2 is installed it is used instead of re, except for
+                                              patterns it does not support or would match differently
+                                              (\\w, \\d, \\s, \\b and $), so the result is the same either way.
             sub_pattern (tuple[str, str] | None, optional): Optional tuple of (search pattern, replace pattern) to modify matched lines. Only the first pattern will be compiled. Default: (r"^(\s*)- (TODO|DONE|DOING|NOW|LATER) ", r"\1- ").
             remove_block_properties (bool, optional): If True, removes Logseq block properties. Default: True.
             keep_new_lines (bool, optional): If True, preserves newlines from Logseq. Default: True.
@@ -65,19 +138,87 @@ class MdXLogseqTODOSync:
         self.sub_pattern = sub_pattern
         if sub_pattern:
             try:
-                self.sub_pattern = re.compile(sub_pattern[0]), sub_pattern[1]
+                self.sub_pattern = _compile(sub_pattern[0]), sub_pattern[1]
             except Exception as e:
                 raise Exception(f"Error when compiling sub_pattern's arguments: '{e}'") from e
+        # the default pattern does not need the full LogseqMarkdownParser
+        self._use_fast_scan = must_match_regex == _DEFAULT_MUST_MATCH_REGEX
+        # other patterns are tested on each block, use re2 if it is installed
+        # and matches the pattern exactly like re (see _RE2_MISMATCH_RE)
+        self._must_match_re = None
+        if re2 is not None and not self._use_fast_scan and not _RE2_MISMATCH_RE.search(must_match_regex):
+            try:
+                options = re2.Options()
+                options.log_errors = False
+                self._must_match_re = re2.compile(must_match_regex, options)
+            except Exception:
+                # not google-re2, or a pattern it does not support
+                # (backreferences, lookarounds)
+                self._must_match_re = None
+        if self._must_match_re is None:
+            try:
+                self._must_match_re = _compile(must_match_regex)
+            except Exception as e:
+                raise Exception(f"Error when compiling must_match_regex argument: '{e}'") from e
+        # the default pattern is simple enough to be checked with plain string methods
+        if self._use_fast_scan:
+            self._must_match = _default_must_match
+        else:
+            self._must_match = self._must_match_re.search
+        # compile the delimiters once, None stands for the special values
+        # "__START__" and "__END__"
+        self._input_start_re = _compile(input_delim_start) if input_delim_start != "__START__" else None
+        self._input_end_re = _compile(input_delim_end) if input_delim_end != "__END__" else None
+        self._output_start_re = _compile(output_delim_start)
+        self._output_end_re = _compile(output_delim_end)
+        # delimiters without regex syntax can be located with str.find
+        self._literal_delims = frozenset(
+            delim for delim in (input_delim_start, input_delim_end, output_delim_start, output_delim_end)
+            if not _REGEX_META_RE.search(delim)
+        )
+        # everything between the output delimiters, delimiters included
+        self._output_section_re = _compile(f"{output_delim_start}.*?{output_delim_end}", re.DOTALL)
         self.remove_block_properties = remove_block_properties
         self.keep_new_lines = keep_new_lines
         self.recursive = True
+        # (mtime, size) of the input file and the lines it produced
+        self._input_cache_key = None
+        self._input_cache_lines = ()
+        # (mtime, size) of the output file after our last write and its content
+        self._output_cache_key = None
+        self._output_cache_content = ""
 
         matched_lines = self.process_input()
         assert matched_lines, "No matching lines found in input"
         self.process_output(matched_lines)
         return
 
-    def _validate_delimiters(self, content: str, delims: Sequence[str], file_type: str) -> None:
+    def _count_up_to_two(self, content: str, delim_re: re.Pattern) -> int:
+        """
+        Count the occurrences of a delimiter, stopping at the second one.
+
+        Args:
+            content (str): The file content.
+            delim_re (re.Pattern): Compiled delimiter.
+
+        Returns:
+            int: 0, 1 or 2 if the delimiter appears at least twice.
+        """
+        delim = delim_re.pattern
+        if delim not in self._literal_delims:
+            return len(list(islice(delim_re.finditer(content), 2)))
+        first = content.find(delim)
+        if first == -1:
+            return 0
+        return 1 if content.find(delim, first + len(delim)) == -1 else 2
+
+    def _validate_delimiters(
+        self,
+        content: str,
+        start_re: typing.Optional[re.Pattern],
+        end_re: typing.Optional[re.Pattern],
+        file_type: str,
+        ) -> None:
         """
         Validate that delimiters appear exactly once in the content.
 
@@ -86,7 +227,8 @@ class MdXLogseqTODOSync:
 
         Args:
             content (str): The file content to check.
-            delims (Sequence[str]): Tuple or list of (start, end) delimiters to check.
+            start_re (re.Pattern | None): Compiled start delimiter, None for "__START__".
+            end_re (re.Pattern | None): Compiled end delimiter, None for "__END__".
             file_type (str): String indicating which file is being checked ('input' or 'output').
 
         Raises:
@@ -97,23 +239,133 @@ class MdXLogseqTODOSync:
             The start delimiter "__START__" is a special case that doesn't need to be present in the content.
             The end delimiter "__END__" is a special case that allows processing until the end of the file.
         """
-        start_delim, end_delim = delims
-
         # Check start delimiter
-        if start_delim != "__START__":
-            start_count = len(re.findall(start_delim, content))
+        if start_re is not None:
+            start_count = self._count_up_to_two(content, start_re)
             if start_count == 0:
-                raise ValueError(f"Start delimiter not found in {file_type} file: {start_delim}")
+                raise ValueError(f"Start delimiter not found in {file_type} file: {start_re.pattern}")
             if start_count > 1:
-                raise ValueError(f"Multiple start delimiters found in {file_type} file: {start_delim}")
+                raise ValueError(f"Multiple start delimiters found in {file_type} file: {start_re.pattern}")
 
         # Check end delimiter
-        end_count = len(re.findall(end_delim, content))
-        if end_count == 0 and end_delim != "__END__":
-            raise ValueError(f"End delimiter not found in {file_type} file: {end_delim}")
-        if end_count > 1:
-            raise ValueError(f"Multiple end delimiters found in {file_type} file: {end_delim}")
+        if end_re is not None:
+            end_count = self._count_up_to_two(content, end_re)
+            if end_count == 0:
+                raise ValueError(f"End delimiter not found in {file_type} file: {end_re.pattern}")
+            if end_count > 1:
+                raise ValueError(f"Multiple end delimiters found in {file_type} file: {end_re.pattern}")
+
+    def _block_start(self, content: str, pos: int) -> int:
+        """
+        Find the offset of the block containing the character at pos.
+
+        Lines that do not start with a bullet point belong to the previous
+        block, so we walk back line by line until we find the bullet.
+
+        Args:
+            content (str): The file content.
+            pos (int): Offset of a character in content.
 
+        Returns:
+            int: Offset of the first line of the block, -1 if pos is before the first block.
+        """
+        line_start = content.rfind("\n", 0, pos) + 1
+        while not _BULLET_RE.match(content, line_start):
+            if line_start == 0:
+                return -1
+            line_start = content.rfind("\n", 0, line_start - 1) + 1
+        return line_start
+
+    def _input_section(self, content: str) -> tuple[str, bool, bool]:
+        """
+        Validate the input delimiters and extract the delimited section.
+
+        The section starts at the block containing the start delimiter and stops
+        right after the end delimiter. The blocks holding the delimiters are kept
+        so that the whitespace stripped by the parser at both ends of the page
+        only belongs to blocks that are dropped anyway.
+
+        Args:
+            content (str): The input file content.
+
+        Returns:
+            tuple[str, bool, bool]: The section, whether its first block is the one holding
+                                    the start delimiter and whether its last block is the
+                                    one holding the end delimiter.
+        """
+        start_re, end_re = self._input_start_re, self._input_end_re
+        self._validate_delimiters(content, start_re, end_re, 'input')
+
+        section_start, section_end = 0, len(content)
+        skip_first_block = skip_last_block = False
+        search_from = 0
+        if start_re is not None:
+            if start_re.pattern in self._literal_delims:
+                start_pos = content.find(start_re.pattern)
+                search_from = start_pos + len(start_re.pattern)
+            else:
+                start_pos, search_from = start_re.search(content).span()
+            section_start = self._block_start(content, start_pos)
+            if section_start == -1:
+                # delimiter is before the first block, keep what follows its line
+                section_start = content.find("\n", search_from) + 1 or len(content)
+            else:
+                skip_first_block = True
+        if end_re is not None:
+            if end_re.pattern in self._literal_delims:
+                end_pos = content.find(end_re.pattern, search_from)
+                delim_end = end_pos + len(end_re.pattern)
+            else:
+                end_match = end_re.search(content, search_from)
+                end_pos, delim_end = (-1, -1) if end_match is None else end_match.span()
+            if end_pos != -1:
+                end_block = self._block_start(content, end_pos)
+                if end_block < section_start:
+                    section_end = section_start
+                # an end delimiter in the block of the start delimiter is ignored, as
+                # that block is skipped as a whole, and the section goes to the end of the file
+                elif not (skip_first_block and end_block == section_start):
+                    # stop after the delimiter so that its block stays a block
+                    section_end = delim_end
+                    skip_last_block = True
+
+        return content[section_start:section_end], skip_first_block, skip_last_block
+
+    @staticmethod
+    def _fast_scan(content: str) -> list[tuple[int, str]]:
+        """
+        Split content into blocks without building LogseqMarkdownParser objects.
+
+        Follows the rules of LogseqMarkdownParser: a line starting with "- " or "* "
+        opens a new block, other lines are appended to the previous block, empty
+        lines are dropped and lines before the first block (page properties) are ignored.
+
+        Args:
+            content (str): The delimited section of the input file.
+
+        Returns:
+            list[tuple[int, str]]: Indentation level (in spaces, a tab counting as 4)
+                                   and content of each block.
+        """
+        blocks = []
+        current = None
+        for line in content.strip().split("\n"):
+            stripped = line.lstrip()
+            if not stripped:
+                continue
+            if stripped.startswith(("- ", "* ")):
+                if stripped[0] == "*":
+                    line = line.replace("* ", "- ", 1)
+                # count the indentation without building a tab-expanded copy
+                indentation = _INDENT_RE.match(line).end()
+                current = [line]
+                blocks.append((indentation + 3 * line.count("\t", 0, indentation), current))
+            elif current is not None:
+                current.append(line)
+
+        return [(level, "\n".join(lines).replace("\xa0", " ")) for level, lines in blocks]
+
+    @beartype
     def process_input(self) -> list[str]:
         """
         Process the input file using LogseqMarkdownParser.
@@ -129,99 +381,250 @@ class MdXLogseqTODOSync:
             ValueError: If input delimiters are missing or appear multiple times.
             FileNotFoundError: If the input file doesn't exist.
             AssertionError: If no blocks or matching lines are found in the input.
-            Exception: If there's an error compiling the must_match_regex.
 
         Note:
             - The special start delimiter "__START__" indicates processing from the beginning of the file.
             - The special end delimiter "__END__" indicates processing until the end of the file.
+            - Only the delimited section of the file is given to LogseqMarkdownParser.
+            - The result is reused as long as the modification time and size of the input file are unchanged.
             - If recursive processing is enabled, it will include nested items under a matching parent.
             - Block properties and LOGBOOK entries can be removed based on the remove_block_properties setting.
         """
-        assert self.input_file.exists() and self.input_file.is_file(), f"File '{self.input_file}' not found or not a file"
-        with open(self.input_file, 'r') as f:
-            content = f.read()
-
-        self._validate_delimiters(content, self.input_delims, 'input')
-
-        # Parse the content using LogseqMarkdownParser
-        page = LogseqMarkdownParser.parse_text(content=content, verbose=False)
-
-        # First collect all matching blocks and their descendants
-        matching_blocks = []
+        # a single stat call both checks the file and gives the cache key
         try:
-            pattern = re.compile(self.must_match_regex)
-        except Exception as e:
-            raise Exception(f"Error when compiling must_match_regex argument: '{e}'") from e
-        start_delim, end_delim = self.input_delims
+            stat = self.input_file.stat()
+        except FileNotFoundError:
+            stat = None
+        assert stat is not None and S_ISREG(stat.st_mode), f"File '{self.input_file}' not found or not a file"
+        # no need to parse again if the file did not change since the last call
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        if cache_key == self._input_cache_key:
+            return list(self._input_cache_lines)
+
+        # Only hand the delimited section to the parser
+        content = self.input_file.read_text(encoding="utf-8")
+        section, skip_first_block, skip_last_block = self._input_section(content)
+
+        # Split the section into (indentation level, content) blocks
+        if self._use_fast_scan:
+            blocks = self._fast_scan(section)
+        else:
+            # parse_text only wraps LogseqPage, the parser keeps no reusable state
+            page = LogseqMarkdownParser.LogseqPage(content=section, verbose=False)
+            blocks = list(map(attrgetter("indentation_level", "content"), page.blocks))
+
+        # Collect the matching blocks and their descendants
+        matched_lines = []
+        # bind the attributes used for each block to locals
+        must_match = self._must_match
+        max_level = self.bulletpoint_max_level
+        recursive = self.recursive
+        remove_properties = self.remove_block_properties
+        keep_line = matched_lines.append
 
-        # Track if we're inside the delimited section
-        inside_section = False
         # Track if we're in a matching block's subtree
         in_matching_subtree = False
         # Track the indentation level of the current matching block
         current_matching_level = -1
-
-        assert page.blocks, "No blocks found in input"
-
-        for block in page.blocks:
-            block_content = block.content
-
-            # Check for delimiter markers
-            if start_delim == "__START__":
-                inside_section = True
-                start_delim = "a"
-                while start_delim in content:
-                    start_delim *= 2
-            elif re.findall(start_delim, block_content):
-                inside_section = True
+        # Indentation of the last kept block, None until a block matched
+        previous_indentation = None
+
+        assert blocks, "No blocks found in input"
+
+        # the blocks holding the delimiters are not part of the section
+        for level, block_content in islice(blocks, int(skip_first_block), len(blocks) - int(skip_last_block)):
+            # Check if this block matches the pattern
+            if must_match(block_content):
+                in_matching_subtree = True
+                current_matching_level = level
+            # If we exit the matching subtree, reset the flags
+            elif in_matching_subtree and level <= current_matching_level:
+                in_matching_subtree = False
+                current_matching_level = -1
                 continue
-            elif inside_section and end_delim != "__END__" and re.findall(end_delim, block_content):
-                break  # Stop processing after end delimiter
-
-            if inside_section:
-                # Check if this block matches the pattern
-                if pattern.search(block_content):
-                    matching_blocks.append(block)
-                    in_matching_subtree = True
-                    current_matching_level = block.indentation_level
-                # If we're in a matching subtree, keep all descendants
-                elif in_matching_subtree and block.indentation_level > current_matching_level:
-                    matching_blocks.append(block)
-                # If we exit the matching subtree, reset the flags
-                elif in_matching_subtree and block.indentation_level <= current_matching_level:
-                    in_matching_subtree = False
-                    current_matching_level = -1
-
-        assert matching_blocks, "No blocks found in input"
-
-        # Process the matching blocks
-        matched_lines = []
-        previous_indentation = matching_blocks[0].indentation_level
-        for block in matching_blocks:
-            if block.indentation_level < previous_indentation:
-                previous_indentation = block.indentation_level
+            # Keep only the matching blocks and their descendants
+            elif not in_matching_subtree:
+                continue
+
+            if previous_indentation is None or level < previous_indentation:
+                previous_indentation = level
 
             # If bulletpoint_max_level is set, skip blocks that are too deep
             if (
-                    self.bulletpoint_max_level == -1 or
-                    block.indentation_level <= self.bulletpoint_max_level or
-                    (self.recursive and block.indentation_level > previous_indentation)
+                    max_level == -1 or
+                    level <= max_level or
+                    (recursive and level > previous_indentation)
             ):
-                previous_indentation = block.indentation_level
-                if self.remove_block_properties:
-                    keys = block.properties.keys()
-                    for k in keys:
-                        block.del_property(k)
-                    if ":LOGBOOK:" in block.content and ":END:" in block.content:
-                        content = re.sub(":LOGBOOK:.*:END:", "", block.content, flags=re.MULTILINE|re.DOTALL).rstrip()
-                        matched_lines.append(content)
-                    else:
-                        matched_lines.append(block.content)
-                else:
-                    matched_lines.append(block.content)
-
+                previous_indentation = level
+                if remove_properties:
+                    if ":: " in block_content:
+                        block_content = _PROPERTY_LINE_RE.sub("", block_content)
+                    block_content, n_logbooks = _LOGBOOK_RE.subn("", block_content)
+                    if n_logbooks:
+                        block_content = block_content.rstrip()
+                keep_line(block_content)
+
+        assert previous_indentation is not None, "No blocks found in input"
+
+        self._input_cache_key = cache_key
+        self._input_cache_lines = tuple(matched_lines)
         return matched_lines
 
+    def _output_lines(self, matched_lines: list[str]) -> tuple[list[str], bool]:
+        """
+        Prepare the matched lines for the output file in a single pass.
+
+        Each line is dropped if it is empty and keep_new_lines is False, then goes
+        through sub_pattern and gets its tabs replaced by 4 spaces.
+
+        Args:
+            matched_lines (list[str]): Lines from process_input.
+
+        Returns:
+            tuple[list[str], bool]: The lines to write between the output delimiters, and
+                                    whether they have to go through dedent.
+
+        Note:
+            dedent is not needed when a line starts at column 0, so that there is no common
+            indentation to remove, and no line ends with whitespace, as dedent also empties
+            the lines made only of whitespace.
+        """
+        keep_new_lines = self.keep_new_lines
+        # bound method of the compiled pattern, looked up once
+        sub, sub_repl = (self.sub_pattern[0].sub, self.sub_pattern[1]) if self.sub_pattern else (None, None)
+        lines = []
+        flush_left = False
+        trailing_whitespace = False
+        for line in matched_lines:
+            if not keep_new_lines and not line.strip():
+                continue
+            if sub is not None:
+                line = sub(sub_repl, line)
+            # most lines have no tab
+            if "\t" in line:
+                line = line.replace("\t", "    ")
+            if not flush_left and line[:1] not in ("", " ", "\n"):
+                flush_left = True
+            if not trailing_whitespace and (line[-1:].isspace() or " \n" in line):
+                trailing_whitespace = True
+            lines.append(line)
+        return lines, trailing_whitespace or not flush_left
+
+    def _replace_output_section(
+        self,
+        content: str,
+        matched_lines: list[str],
+        ) -> str | None:
+        """
+        Validate the output delimiters and put the matched lines between them.
+
+        Args:
+            content (str): The output file content.
+            matched_lines (list[str]): Lines from process_input.
+
+        Returns:
+            str | None: The new content of the output file, or None if the section is already up to date.
+
+        Raises:
+            ValueError: If output delimiters appear multiple times in the existing file.
+        """
+        # Only validate if file exists and has content
+        if content:
+            self._validate_delimiters(content, self._output_start_re, self._output_end_re, 'output')
+
+        start_delim, end_delim = self.output_delims
+
+        # Prepare the replacement content
+        lines, needs_dedent = self._output_lines(matched_lines)
+        body = "\n".join(lines)
+        if needs_dedent:
+            body = dedent(body)
+        replacement = "\n".join((start_delim, body, end_delim))
+
+        # Find the content between delimiters, delimiters included
+        section = self._output_section_re.search(content)
+
+        # Replace content between delimiters or append if not found
+        if section is not None:
+            section_start, section_end = section.span()
+            # comparing the section alone avoids building the new content for nothing
+            if content[section_start:section_end] == replacement:
+                return None
+            return content[:section_start] + replacement + content[section_end:]
+        return f"{content}\n{replacement}" if content else replacement
+
+    def _write_output(self, data: bytes) -> None:
+        """
+        Write data to the output file, atomically when it is a regular file.
+
+        Symlinks are followed. A regular file is replaced through _replace_output so
+        that readers never see a partially written file. Other files are written in
+        place, as replacing them would break them: devices, fifos and other non
+        regular files, files with several hard links, and files whose directory we
+        cannot write to or whose owner cannot be given to a new file.
+
+        Args:
+            data (bytes): The new content of the output file.
+        """
+        target = self.output_file.resolve()
+        try:
+            stat = target.stat()
+        except FileNotFoundError:
+            stat = None
+        if stat is None or (S_ISREG(stat.st_mode) and stat.st_nlink == 1):
+            try:
+                self._replace_output(target, data, stat)
+                return
+            except PermissionError:
+                # read only directory or owner we cannot set, an existing file can still be written
+                if stat is None:
+                    raise
+        with open(target, "wb") as f:
+            f.write(data)
+
+    def _replace_output(self, target: Path, data: bytes, stat: typing.Optional[os.stat_result]) -> None:
+        """
+        Atomically replace the output file with data.
+
+        The data is written to a temporary file in the same directory which is then
+        renamed over the output file. The data is synced to disk before the rename so
+        that it survives a crash. The permissions and owner of the existing file are kept.
+
+        Args:
+            target (Path): The resolved path of the output file.
+            data (bytes): The new content of the output file.
+            stat (os.stat_result | None): Status of the existing output file, None if there is none.
+
+        Raises:
+            PermissionError: If the directory is not writable or the owner of the existing
+                             file cannot be given to the temporary file.
+        """
+        while True:
+            tmp_path = target.parent / f".{target.name}.{os.urandom(4).hex()}.tmp"
+            try:
+                # a new file gets the default permissions, the kernel applies the umask
+                fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o666)
+                break
+            except FileExistsError:
+                continue
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                # the data must be on disk before the rename is, or a crash
+                # could leave an empty output file
+                f.flush()
+                os.fsync(f.fileno())
+                if stat is not None:
+                    tmp_stat = os.fstat(f.fileno())
+                    if (tmp_stat.st_uid, tmp_stat.st_gid) != (stat.st_uid, stat.st_gid):
+                        os.chown(tmp_path, stat.st_uid, stat.st_gid)
+                    os.chmod(tmp_path, S_IMODE(stat.st_mode))
+            os.replace(tmp_path, target)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @beartype
     def process_output(self, matched_lines: list[str]) -> None:
         """
         Process the output file by replacing content between delimiters with matched lines.
@@ -242,36 +645,30 @@ class MdXLogseqTODOSync:
             - The method applies any substitution patterns specified in sub_pattern.
             - It respects the keep_new_lines setting when processing the matched lines.
             - The final content is written with spaces instead of tabs for consistency.
+            - The output file is not read again if its modification time and size did not change since the last write.
+            - The file is replaced atomically, through a temporary file in the same directory,
+              and is not written at all if its content would not change.
         """
-        # Read the output file content
+        # Read the output file content, unless it was not modified since we wrote it
         try:
-            with open(self.output_file, 'r') as f:
-                content = f.read()
-                # Only validate if file exists and has content
-                if content:
-                    self._validate_delimiters(content, self.output_delims, 'output')
+            stat = self.output_file.stat()
         except FileNotFoundError:
-            content = ""  # Start with empty content if file doesn't exist
-
-        start_delim, end_delim = self.output_delims
-
-        # Create the pattern to match everything between delimiters
-        pattern = f"{start_delim}.*?{end_delim}"
-
-        # Prepare the replacement content
-        replacement = f"{start_delim}\n"
-        filtered_lines = [m for m in matched_lines if (self.keep_new_lines or m.strip())]
-        if self.sub_pattern:
-            filtered_lines = [re.sub(self.sub_pattern[0], self.sub_pattern[1], line) for line in filtered_lines]
-        replacement += dedent("\n".join(filtered_lines).replace("\t", "    "))
-        replacement += f"\n{end_delim}"
-
-        # Replace content between delimiters or append if not found
-        if re.search(pattern, content, re.DOTALL):
-            new_content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+            stat = None
+        if stat is None:
+            # Start with empty content if file doesn't exist
+            content = ""
+        elif (stat.st_mtime_ns, stat.st_size) == self._output_cache_key:
+            content = self._output_cache_content
         else:
-            new_content = content + "\n" + replacement if content else replacement
+            content = self.output_file.read_text(encoding="utf-8")
+        new_content = self._replace_output_section(content, matched_lines)
+
+        # Nothing to write if the file is already up to date
+        if new_content is None:
+            return
 
         # Write the modified content back to the file
-        with open(self.output_file, 'w') as f:
-            f.write(new_content)
+        self._write_output(new_content.encode("utf-8"))
+        stat = self.output_file.stat()
+        self._output_cache_key = (stat.st_mtime_ns, stat.st_size)
+        self._output_cache_content = new_content
@@ -9,8 +9,9 @@ __all__ = ["MdXLogseqTODOSync"]
 __VERSION__ = MdXLogseqTODOSync.VERSION
 
 def cli_launcher() -> None:
-    if sys.argv[-1] ==  "--version":
-        return(f"MdXLogseqTODOSync version: {__VERSION__}")
+    if "--version" in sys.argv:
+        print(f"MdXLogseqTODOSync version: {__VERSION__}")
+        sys.exit(0)
     _ = fire.Fire(MdXLogseqTODOSync)
     return None
 
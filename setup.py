@@ -34,4 +34,7 @@ setup(
         'beartype >= 0.18.5',
         "LogseqMarkdownParser >= 3.3"
     ],
+    extras_require={
+        "fast": ["google-re2"],
+    },
 )
@@ -0,0 +1,38 @@
+import unittest
+from pathlib import Path
+
+import LogseqMarkdownParser
+
+from MdXLogseqTODOSync import MdXLogseqTODOSync
+from MdXLogseqTODOSync.MdXLogseqTODOSync import _PROPERTY_LINE_RE
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class TestFastScanParity(unittest.TestCase):
+    "_fast_scan and _PROPERTY_LINE_RE must give the same result as LogseqMarkdownParser."
+
+    def fixtures(self):
+        for fixture in sorted(FIXTURES.glob("*.md")):
+            yield fixture.name, fixture.read_text(encoding="utf-8")
+
+    def test_blocks(self):
+        for name, content in self.fixtures():
+            with self.subTest(fixture=name):
+                page = LogseqMarkdownParser.LogseqPage(content=content, verbose=False)
+                expected = [(block.indentation_level, block.content) for block in page.blocks]
+                self.assertEqual(MdXLogseqTODOSync._fast_scan(content), expected)
+
+    def test_property_removal(self):
+        for name, content in self.fixtures():
+            page = LogseqMarkdownParser.LogseqPage(content=content, verbose=False)
+            for block in page.blocks:
+                with self.subTest(fixture=name, block=block.content):
+                    removed = _PROPERTY_LINE_RE.sub("", block.content)
+                    for key in list(block.properties.keys()):
+                        block.del_property(key)
+                    self.assertEqual(removed, block.content)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from MdXLogseqTODOSync import MdXLogseqTODOSync
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class TestInputSection(unittest.TestCase):
+    def sync(self, fixture: str, **kwargs) -> str:
+        "Run MdXLogseqTODOSync on a fixture delimited by BEGIN and END, return the output file."
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = Path(tmp) / "output.md"
+            MdXLogseqTODOSync(
+                input_file=FIXTURES / fixture,
+                output_file=output_file,
+                input_delim_start="BEGIN",
+                input_delim_end="END",
+                **kwargs,
+            )
+            return output_file.read_text()
+
+    def test_empty_block_before_end_delimiter(self):
+        # the empty block must not become a continuation line of the previous one
+        expected = "<!-- BEGIN_TODO -->\n- a\n<!-- END_TODO -->"
+        self.assertEqual(self.sync("empty_block_before_end.md"), expected)
+        self.assertEqual(self.sync("empty_block_before_end.md", must_match_regex="TODO"), expected)
+
+    def test_delimiters_in_the_same_block(self):
+        # the end delimiter is skipped with the start block, the section goes to the end of the file
+        expected = "<!-- BEGIN_TODO -->\n- y\n<!-- END_TODO -->"
+        self.assertEqual(self.sync("same_block_delimiters.md"), expected)
+        self.assertEqual(self.sync("same_block_delimiters.md", must_match_regex="TODO"), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from MdXLogseqTODOSync import MdXLogseqTODOSync
+
+SECTION = "<!-- BEGIN_TODO -->\n- a\n- b\n<!-- END_TODO -->"
+
+
+class TestProcessOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.input_file = self.dir / "input.md"
+        self.input_file.write_text("- TODO a\n- DONE b\n")
+        self.output_file = self.dir / "output.md"
+
+    def sync(self, output_file: Path = None, **kwargs) -> MdXLogseqTODOSync:
+        "Sync the input file into output_file, the default output file if None."
+        return MdXLogseqTODOSync(
+            input_file=self.input_file,
+            output_file=output_file or self.output_file,
+            **kwargs,
+        )
+
+    def test_new_file(self):
+        self.sync()
+        self.assertEqual(self.output_file.read_text(), SECTION)
+
+    def test_new_file_permissions_follow_umask(self):
+        umask = os.umask(0o027)
+        try:
+            self.sync()
+        finally:
+            os.umask(umask)
+        self.assertEqual(stat.S_IMODE(self.output_file.stat().st_mode), 0o640)
+
+    def test_only_the_section_is_replaced(self):
+        self.output_file.write_text("before\n<!-- BEGIN_TODO -->\nold\n<!-- END_TODO -->\nafter\n")
+        self.sync()
+        self.assertEqual(self.output_file.read_text(), f"before\n{SECTION}\nafter\n")
+
+    def test_missing_delimiters_are_refused(self):
+        self.output_file.write_text("before")
+        with self.assertRaises(ValueError):
+            # the delimiters must already be in a non empty output file
+            self.sync()
+        self.assertEqual(self.output_file.read_text(), "before")
+
+    def test_regex_delimiters_behave_like_literal_ones(self):
+        # "." makes the delimiters regexes, they still match their own text
+        start, end = "<!-- BEGIN.TODO -->", "<!-- END.TODO -->"
+        for output_delim_start, output_delim_end in ((start, end), ("<!-- BEGIN_TODO -->", "<!-- END_TODO -->")):
+            with self.subTest(delimiter=output_delim_start):
+                self.output_file.write_bytes(
+                    f"before\r\n{output_delim_start}\r\nold\r\n{output_delim_end}\r\nafter\r\n".encode()
+                )
+                self.sync(output_delim_start=output_delim_start, output_delim_end=output_delim_end)
+                # line endings are normalised like when reading the file in text mode
+                self.assertEqual(
+                    self.output_file.read_bytes(),
+                    f"before\n{output_delim_start}\n- a\n- b\n{output_delim_end}\nafter\n".encode(),
+                )
+
+    def test_non_utf8_output_is_refused(self):
+        for output_delim_start in ("<!-- BEGIN_TODO -->", "<!-- BEGIN.TODO -->"):
+            with self.subTest(delimiter=output_delim_start):
+                self.output_file.write_bytes(f"\xe9\n{output_delim_start}\nold\n<!-- END_TODO -->\n".encode("latin-1"))
+                with self.assertRaises(UnicodeDecodeError):
+                    self.sync(output_delim_start=output_delim_start)
+
+    def test_permissions_are_kept(self):
+        self.output_file.write_text(SECTION.replace("- a", "old"))
+        self.output_file.chmod(0o640)
+        self.sync()
+        self.assertEqual(self.output_file.read_text(), SECTION)
+        self.assertEqual(stat.S_IMODE(self.output_file.stat().st_mode), 0o640)
+
+    def test_symlink_is_followed(self):
+        target = self.dir / "target.md"
+        target.write_text(SECTION.replace("- a", "old"))
+        self.output_file.symlink_to(target)
+        self.sync()
+        self.assertTrue(self.output_file.is_symlink())
+        self.assertEqual(target.read_text(), SECTION)
+
+    def test_hard_link_is_kept(self):
+        other_link = self.dir / "other.md"
+        self.output_file.write_text(SECTION.replace("- a", "old"))
+        os.link(self.output_file, other_link)
+        self.sync()
+        self.assertEqual(other_link.read_text(), SECTION)
+        self.assertTrue(os.path.samefile(self.output_file, other_link))
+
+    def test_read_only_directory_writes_in_place(self):
+        self.output_file.write_text(SECTION.replace("- a", "old"))
+        inode = self.output_file.stat().st_ino
+        with mock.patch.object(MdXLogseqTODOSync, "_replace_output", side_effect=PermissionError):
+            self.sync()
+        self.assertEqual(self.output_file.read_text(), SECTION)
+        self.assertEqual(self.output_file.stat().st_ino, inode)
+
+    @unittest.skipUnless(hasattr(os, "geteuid") and os.geteuid() == 0, "creating a device node needs root")
+    def test_device_is_not_replaced(self):
+        device = self.dir / "null"
+        os.mknod(device, 0o666 | stat.S_IFCHR, os.makedev(1, 3))
+        self.sync(output_file=device)
+        self.assertTrue(stat.S_ISCHR(device.stat().st_mode))
+
+    def test_unchanged_output_is_not_written(self):
+        self.sync()
+        # an old mtime makes sure that the output cache is not used
+        os.utime(self.output_file, ns=(0, 0))
+        before = self.output_file.stat()
+        self.sync()
+        after = self.output_file.stat()
+        self.assertEqual((after.st_ino, after.st_mtime_ns), (before.st_ino, before.st_mtime_ns))
+
+    def test_output_cache(self):
+        sync = self.sync()
+        # the file is unchanged since it was written, it is not read again
+        with mock.patch.object(Path, "read_text", side_effect=AssertionError("output file was read")):
+            sync.process_output(["- TODO c"])
+        self.assertEqual(self.output_file.read_text(), SECTION.replace("- a\n- b", "- c"))
+
+        # a file modified by someone else is read again
+        self.output_file.write_text(f"before\n{self.output_file.read_text()}\n")
+        sync.process_output(["- TODO a", "- DONE b"])
+        self.assertEqual(self.output_file.read_text(), f"before\n{SECTION}\n")
+
+
+if __name__ == "__main__":
+    unittest.main()